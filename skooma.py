@@ -1,92 +1,528 @@
 import pandas as pd
 import numpy as np
+import sys
 from typing import Callable, Any
+from concurrent.futures import ThreadPoolExecutor
 import datetime
+import weakref
+
+# dtype.kind codes for which a rule may be applied to a whole array of values at once
+_VECTORIZABLE_KINDS = "iufbM"
+
+
+def _vectorized_mask(rule: Callable[[Any], Any], arr):
+    """
+    Apply a rule to a whole array in one call. Returns a boolean mask of the valid values, or None if the rule
+    cannot be applied element-wise (i.e. it raises or does not return a boolean array of the same shape).
+    """
+    # Only numeric, boolean and datetime arrays behave like their values under operators; e.g. x[:2] takes the first
+    # two characters of a string, but the first two items of an array of strings
+    if arr.dtype.kind not in _VECTORIZABLE_KINDS:
+        return None
+    try:
+        out = rule(arr)
+    except Exception:
+        return None
+    if isinstance(out, np.ndarray) and out.dtype == bool and out.shape == arr.shape:
+        return out
+    return None
+
+
+def _try_vectorized(rule: Callable[[Any], Any], arr):
+    """Like _vectorized_mask, but returns the values that fail the rule (or None)."""
+    mask = _vectorized_mask(rule, arr)
+    return None if mask is None else arr[~mask]
+
+
+# numba ufuncs compiled from scalar rules, so a rule shared by several Types/Schemas is only compiled once. Rules that
+# numba failed to compile map to None, so they are not retried
+_JIT_CACHE = weakref.WeakKeyDictionary()
+
+
+def _jit_compile(rule: Callable[[Any], Any]):
+    """
+    Compile a scalar rule into a NumPy ufunc with numba.vectorize. Returns None if numba is not installed or has
+    already failed to compile the rule.
+    """
+    try:
+        return _JIT_CACHE[rule]
+    except (KeyError, TypeError):
+        pass
+    try:
+        import numba
+    except ImportError:
+        return None
+    # Without explicit signatures, numba compiles a version of the ufunc for each input dtype on first use
+    ufunc = numba.vectorize(nopython=True)(rule)
+    try:
+        _JIT_CACHE[rule] = ufunc
+    except TypeError:  # The rule cannot be weakly referenced
+        pass
+    return ufunc
+
+
+def _jit_failed(rule: Callable[[Any], Any]):
+    """Record that numba could not compile a rule, so later calls skip straight to the uncompiled rule."""
+    try:
+        _JIT_CACHE[rule] = None
+    except TypeError:  # The rule cannot be weakly referenced
+        pass
+
+
+def _safe(rule: Callable[[Any], Any], x) -> Any:
+    """Apply a rule to a single value. Returns True/False, or the exception raised by the rule."""
+    try:
+        return bool(rule(x))
+    except Exception as err:
+        return err
+
+
+def _unique_bool(arr: np.ndarray) -> np.ndarray:
+    return np.flatnonzero(np.bincount(arr.view(np.uint8), minlength=2)).astype(bool)
+
+
+def _unique_int(arr: np.ndarray) -> np.ndarray:
+    # Counting is faster than hashing when the range of values is no larger than the array
+    if len(arr):
+        lo, hi = int(arr.min()), int(arr.max())
+        # Offset in np.intp, since arr - lo can overflow the column's own dtype (e.g. int8 values -128 and 127)
+        intp = np.iinfo(np.intp)
+        if hi - lo < len(arr) and intp.min <= lo and hi <= intp.max:
+            counts = np.bincount(arr.astype(np.intp) - lo)
+            return (np.flatnonzero(counts) + lo).astype(arr.dtype)
+    return pd.unique(arr)
+
+
+# Fastest way to find the unique values in a NumPy array, by dtype.kind (pd.unique for any kind not listed)
+_UNIQUE_BY_KIND = {
+    "b": _unique_bool,
+    "i": _unique_int,
+    "u": _unique_int,
+    "f": np.unique,
+}
+
+
+def _unique(arr):
+    """Return the unique values in a NumPy array or ExtensionArray."""
+    if isinstance(arr, np.ndarray):
+        return _UNIQUE_BY_KIND.get(arr.dtype.kind, pd.unique)(arr)
+    # pd.unique converts some ExtensionArrays (e.g. DatetimeArray) to NumPy
+    return arr.unique()
+
+
+def _values(series: pd.Series):
+    """
+    Return the values in a Series as a NumPy array, or as an ExtensionArray for non-NumPy dtypes and datetimes (so
+    that rules see pd.Timestamp rather than np.datetime64 values).
+    """
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind not in "mM":
+        return series.to_numpy(copy=False)
+    return series.array
+
+
+def _fingerprint(arr):
+    """
+    Return a hash of the values in an array (ignoring their order), or None if the array's dtype may hold values that
+    pd.util.hash_array cannot tell apart by type. For example, 'object' arrays and categoricals with 'object'
+    categories are hashed by each value's string form, so 1 and '1' collide.
+    """
+    if not (
+        arr.dtype.kind in _VECTORIZABLE_KINDS or isinstance(arr.dtype, pd.StringDtype)
+    ):
+        return None
+    return (str(arr.dtype), len(arr), int(pd.util.hash_array(arr).sum()))
+
+
+def _polars_kind(dtype) -> str:
+    """Return the NumPy dtype.kind that corresponds to a polars dtype ('O' if there is none)."""
+    import polars as pl
+
+    if dtype.is_signed_integer():
+        return "i"
+    if dtype.is_unsigned_integer():
+        return "u"
+    if dtype.is_float():
+        return "f"
+    if dtype == pl.Boolean:
+        return "b"
+    if dtype == pl.String:
+        return "U"
+    if dtype in (pl.Date, pl.Datetime):
+        return "M"
+    return "O"
+
+
+def _polars_values(series):
+    """Convert a polars.Series to the kind of array Type.validate_array expects."""
+    if series.null_count():
+        # NumPy has no missing values for e.g. integers, so keep the Python objects (with None for missing values)
+        return np.array(series.to_list(), dtype=object)
+    return _values(pd.Series(series.to_numpy()))
 
 
 class Type:
-    def __init__(self, rule: Callable[[Any], Any] = None, types: list = None):
+    _np_kind = ""  # dtype.kind codes for which every value in the column is already of a valid type
+
+    def __init__(
+        self,
+        rule: Callable[[Any], Any] = None,
+        types: list = None,
+        determined_by_unique: bool = True,
+        jit: bool = False,
+    ):
         self.rule = rule
         self.types = types
+        self._types_set = frozenset(types) if types else frozenset()
+        # If True, the rule is applied to the unique values in the column; otherwise, vectorizable rules are applied
+        # to the full column, skipping the cost of uniquifying it
+        self.determined_by_unique = determined_by_unique
+        self.jit = jit  # If True (and numba is installed), compile the rule into a ufunc for numeric columns
+        self._jit_disabled = False  # Set if numba fails to compile the rule
+
+    def _apply_vectorized(self, arr):
+        """Like _try_vectorized(self.rule, arr), but tries a numba-compiled rule first if self.jit is set."""
+        if (
+            self.jit
+            and not self._jit_disabled
+            and isinstance(arr, np.ndarray)
+            and arr.dtype.kind in "iufb"
+        ):
+            ufunc = _jit_compile(self.rule)
+            if ufunc is not None:
+                try:
+                    # Match the NumPy path, which does not warn about comparisons with NaN
+                    with np.errstate(invalid="ignore"):
+                        return arr[~ufunc(arr).astype(bool)]
+                except Exception:
+                    # e.g. numba cannot type the rule; fall back to the uncompiled rule from now on
+                    _jit_failed(self.rule)
+                    self._jit_disabled = True
+        return _try_vectorized(self.rule, arr)
 
     def validate(self, series: pd.Series) -> list:
+        return self.validate_array(series.name, _values(series))
+
+    def validate_array(self, col, arr) -> list:
+        """Validate the values of column 'col', given as a NumPy array (or ExtensionArray, for non-NumPy dtypes)."""
         errors = []
-        col = series.name
         if self.rule:
-            for x in series.unique():
-                try:
-                    if not (type(x) in self.types and self.rule(x)):
-                        errors.append(f"Invalid value in column '{col}': {x}")
-                except Exception as err:
-                    errors.append(f"Invalid value in column '{col}': {x} ({err})")
+            # Check the type of the whole column at once, falling back to per-value checks (e.g. for 'object' columns)
+            if self._is_typed(arr.dtype):
+                if not self.determined_by_unique:
+                    bad = self._apply_vectorized(arr)
+                    if bad is not None:
+                        return [
+                            f"Invalid value in column '{col}': {x}"
+                            for x in _unique(bad)
+                        ]
+                values = _unique(arr)
+                typed = np.ones(len(values), dtype=bool)
+            else:
+                values = _unique(arr)
+                typed = np.fromiter(
+                    (type(x) in self._types_set for x in values),
+                    dtype=bool,
+                    count=len(values),
+                )
+            # If every value has a valid type, try applying the rule to all of them at once
+            if typed.all():
+                bad = self._apply_vectorized(values)
+                if bad is not None:
+                    return [f"Invalid value in column '{col}': {x}" for x in bad]
+            # Otherwise, build the mask one value at a time, keeping any exceptions for the error messages
+            outcomes = [
+                _safe(self.rule, x) if is_typed else False
+                for x, is_typed in zip(values, typed)
+            ]
+            for x, outcome in zip(values, outcomes):
+                if isinstance(outcome, Exception):
+                    errors.append(f"Invalid value in column '{col}': {x} ({outcome})")
+                elif not outcome:
+                    errors.append(f"Invalid value in column '{col}': {x}")
         return errors
 
+    def _is_typed(self, dtype) -> bool:
+        return dtype.kind in self._np_kind
+
+    def _polars_expr(self, col, dtype):
+        """
+        Return a polars expression that is True for the valid values in column 'col' (with polars dtype 'dtype'), or
+        None if the column must be validated with validate_array instead.
+        """
+        import polars as pl
+
+        kind = _polars_kind(dtype)
+        if not (self.rule and kind in self._np_kind and kind in _VECTORIZABLE_KINDS):
+            return None
+        rule = self.rule
+
+        def apply(series):
+            # Run the rule on NumPy values, as validate() does: polars operators differ (e.g. NaN == NaN is True).
+            # This also rejects results of the wrong length, which polars would otherwise broadcast
+            mask = _vectorized_mask(rule, _polars_values(series))
+            if mask is None:
+                raise TypeError("Rule is not vectorizable")
+            return pl.Series(mask)
+
+        return pl.col(col).map_batches(apply, return_dtype=pl.Boolean)
+
+
+# Python/NumPy types accepted by each Type subclass. Deprecated NumPy aliases (np.float_, np.string_, np.unicode) are
+# spelled out as the types they alias, since they were removed in NumPy 2.0
+_INTEGER_TYPES = (
+    int,
+    np.int_,
+    np.int8,
+    np.int16,
+    np.int32,
+    np.int64,
+    np.uint8,
+    np.uint16,
+    np.uint32,
+    np.uint64,
+)
+_FLOAT_TYPES = (float, np.float16, np.float32, np.float64)
+_BOOLEAN_TYPES = (bool, np.bool_)
+_STRING_TYPES = (str, np.bytes_, np.str_)
+_DATETIME_TYPES = (datetime.date, datetime.datetime)
+
 
 class Integer(Type):
-    def __init__(self, rule: Callable[[Any], Any] = None):
-        super().__init__(
-            rule,
-            [
-                int,
-                np.int_,
-                np.int8,
-                np.int16,
-                np.int32,
-                np.int64,
-                np.uint8,
-                np.uint16,
-                np.uint32,
-                np.uint64,
-            ],
-        )
+    _np_kind = "iu"
+
+    def __init__(self, rule: Callable[[Any], Any] = None, **kwargs):
+        super().__init__(rule, _INTEGER_TYPES, **kwargs)
 
 
 class Float(Type):
-    def __init__(self, rule: Callable[[Any], Any] = None):
-        super().__init__(rule, [float, np.float_, np.float16, np.float32, np.float64])
+    _np_kind = "f"
+
+    def __init__(self, rule: Callable[[Any], Any] = None, **kwargs):
+        super().__init__(rule, _FLOAT_TYPES, **kwargs)
 
 
 class Boolean(Type):
-    def __init__(self, rule: Callable[[Any], Any] = None):
-        super().__init__(rule, [bool, np.bool_])
+    _np_kind = "b"
+
+    def __init__(self, rule: Callable[[Any], Any] = None, **kwargs):
+        super().__init__(rule, _BOOLEAN_TYPES, **kwargs)
 
 
 class String(Type):
-    def __init__(self, rule: Callable[[Any], Any] = None):
-        super().__init__(rule, [str, np.string_, np.unicode])
+    _np_kind = "US"  # Not 'O': object columns may hold mixed types
+
+    def __init__(
+        self,
+        rule: Callable[[Any], Any] = None,
+        rule_arrow: Callable[[Any], Any] = None,
+        **kwargs,
+    ):
+        # Columns that cannot be converted to Arrow (e.g. 'object' columns) are validated with the scalar rule, so
+        # rule_arrow on its own would silently check nothing for them
+        if rule_arrow is not None and rule is None:
+            raise ValueError("rule_arrow requires an equivalent scalar rule")
+        super().__init__(rule, _STRING_TYPES, **kwargs)
+        # Optional rule for string extension columns (e.g. dtype 'string[pyarrow]'). Takes a pyarrow.Array and returns
+        # a pyarrow.BooleanArray, e.g. lambda a: pc.equal(pc.utf8_length(a), 1) with pyarrow.compute imported as pc
+        self.rule_arrow = rule_arrow
+
+    def validate_array(self, col, arr) -> list:
+        if self.rule_arrow is not None and self._is_arrow_compatible(arr):
+            import pyarrow as pa
+            import pyarrow.compute as pc
+
+            values = pa.array(arr)
+            # Missing values are invalid, as they would be for a scalar rule
+            valid = pc.fill_null(self.rule_arrow(values), False)
+            bad = pc.unique(pc.filter(values, pc.invert(valid)))
+            return [f"Invalid value in column '{col}': {x}" for x in bad.to_pylist()]
+        return super().validate_array(col, arr)
+
+    def _is_typed(self, dtype) -> bool:
+        # pd.StringDtype has kind 'O' but only holds strings (and missing values)
+        return super()._is_typed(dtype) or isinstance(dtype, pd.StringDtype)
+
+    @staticmethod
+    def _is_arrow_compatible(arr) -> bool:
+        # String extension arrays (pd.StringDtype, pd.ArrowDtype(pa.string())) can be converted to pyarrow.Array
+        return hasattr(arr, "__arrow_array__") and arr.dtype.type is str
 
 
 class DateTime(Type):
-    def __init__(self, rule: Callable[[Any], Any] = None):
-        super().__init__(rule, [datetime.date, datetime.datetime])
+    _np_kind = "M"
+
+    def __init__(self, rule: Callable[[Any], Any] = None, **kwargs):
+        super().__init__(rule, _DATETIME_TYPES, **kwargs)
+
+
+class Enum(Type):
+    """
+    Accepts only the values in 'allowed'. Equivalent to a rule like lambda x: x in {"A", "B"}, but checks the whole
+    column at once with pd.Series.isin.
+    """
+
+    def __init__(self, allowed):
+        super().__init__()
+        self.allowed = list(allowed)
+
+    def validate_array(self, col, arr) -> list:
+        series = pd.Series(arr, copy=False)
+        bad = series[~series.isin(self.allowed)].unique()
+        return [f"Invalid value in column '{col}': {x}" for x in bad]
+
+    def _polars_expr(self, col, dtype):
+        import polars as pl
+
+        return pl.col(col).is_in(self.allowed)
 
 
 class Schema:
-    def __init__(self, schema: dict, strict=True):
+    def __init__(self, schema: dict, strict=True, verbose=False, max_errors=None):
         assert type(schema) is dict
         self.schema = schema
         self.strict = strict  # If True, self.schema must have a rule for every column in the dataframe passed to .validate()
+        self.verbose = verbose  # If True, the @validate decorator logs its progress when validating with this Schema
+        if max_errors is not None and max_errors < 1:
+            raise ValueError("max_errors must be at least 1")
+        self.max_errors = max_errors  # If set, .validate() stops checking columns once this many errors are found
+        # id(df) -> (weak reference to df, shape, columns) for DataFrames that passed validation. Entries are removed when
+        # the DataFrame is garbage collected, and must refer to the same live object to match, so reused ids never do
+        self._validated = {}
+        # Column name -> (rule id, fingerprint of its values) for columns that passed validation
+        self._col_cache = {}
+
+    def clear_cache(self):
+        self._col_cache.clear()
+
+    def _stop(self, errors) -> bool:
+        return self.max_errors is not None and len(errors) >= self.max_errors
+
+    def _print_errors(self, errors, skipped=False):
+        # Only note the limit if it actually hid something: errors beyond it, or columns left unchecked
+        if skipped or (self.max_errors is not None and len(errors) > self.max_errors):
+            errors = errors[: self.max_errors]
+            errors.append(f"Stopped after {self.max_errors} errors")
+        sys.stdout.write("\n".join(errors) + "\n")
+
+    def _has_passed(self, df: pd.DataFrame) -> bool:
+        entry = self._validated.get(id(df))
+        return (
+            entry is not None
+            and entry[0]() is df
+            and entry[1:] == (df.shape, tuple(df.columns))
+        )
+
+    def _mark_passed(self, df: pd.DataFrame):
+        key = id(df)
+
+        def forget(ref):
+            if self._validated.get(key, (None,))[0] is ref:
+                del self._validated[key]
+
+        self._validated[key] = (weakref.ref(df, forget), df.shape, tuple(df.columns))
 
     def validate(self, df: pd.DataFrame) -> bool:
         schema = self.schema
+        # Skip DataFrames that have already passed validation against this Schema
+        if self._has_passed(df):
+            return True
         errors = []
+        # Compare column names as sets (the dict keys of the schema are already hashed) rather than via df.__contains__
+        df_cols = set(df.columns)
         # If in strict mode, check that all columns appear in Schema
         if self.strict:
-            for col in df:
-                if not col in schema:
-                    errors.append(f"Column '{col}' not found in Schema")
+            errors.extend(
+                f"Column '{col}' not found in Schema"
+                for col in df.columns
+                if col not in schema
+            )
+        # Fetch the values of every column to be validated in one pass
+        arrays = {
+            col: _values(df[col]) for col in schema if col in df_cols and schema[col]
+        }
+        skipped = False
         for col in schema:
+            if self._stop(errors):
+                skipped = True
+                break
             # Check that the column is in the DataFrame
-            if not col in df:
+            if col not in df_cols:
                 errors.append(f"Column '{col}' not found in DataFrame")
             # If the column is present, test each unique value against the schema requirements
             else:
                 rule = schema[col]
                 if rule:
-                    errors += rule.validate(df[col])
+                    # Skip columns whose values are unchanged since they last passed validation
+                    fingerprint = _fingerprint(arrays[col])
+                    cache_key = (id(rule), fingerprint)
+                    if (
+                        fingerprint is not None
+                        and self._col_cache.get(col) == cache_key
+                    ):
+                        continue
+                    col_errors = rule.validate_array(col, arrays[col])
+                    if col_errors:
+                        errors += col_errors
+                    elif fingerprint is not None:
+                        self._col_cache[col] = cache_key
 
         if len(errors):
-            [print(e) for e in errors]
+            self._print_errors(errors, skipped)
+            return False
+        self._mark_passed(df)
+        return True
+
+    def validate_polars(self, df) -> bool:
+        """
+        Validate a polars.DataFrame. Rules are evaluated as polars expressions where possible (i.e. for vectorizable
+        rules on columns whose dtype matches their Type), and with Type.validate_array otherwise.
+        """
+        import polars as pl
+
+        schema = self.schema
+        errors = []
+        df_cols = set(df.columns)
+        # If in strict mode, check that all columns appear in Schema
+        if self.strict:
+            errors.extend(
+                f"Column '{col}' not found in Schema"
+                for col in df.columns
+                if col not in schema
+            )
+        exprs = {}
+        for col in schema:
+            if col in df_cols and schema[col]:
+                expr = schema[col]._polars_expr(col, df.schema[col])
+                if expr is not None:
+                    exprs[col] = expr.fill_null(False).alias(col)
+        # Evaluate all expressions in a single query; if that fails, find out which rules are not vectorizable
+        try:
+            masks = df.select(list(exprs.values()))
+        except Exception:
+            masks = {}
+            for col, expr in exprs.items():
+                try:
+                    masks[col] = df.select(expr)[col]
+                except Exception:
+                    pass
+        skipped = False
+        for col in schema:
+            if self._stop(errors):
+                skipped = True
+                break
+            # Check that the column is in the DataFrame
+            if col not in df_cols:
+                errors.append(f"Column '{col}' not found in DataFrame")
+            else:
+                rule = schema[col]
+                if rule and col in masks:
+                    bad = df[col].filter(~masks[col]).unique(maintain_order=True)
+                    errors += [f"Invalid value in column '{col}': {x}" for x in bad]
+                elif rule:
+                    errors += rule.validate_array(col, _polars_values(df[col]))
+
+        if len(errors):
+            self._print_errors(errors, skipped)
             return False
         return True
 
@@ -103,24 +539,46 @@ def validate(args=None, returns=None):
     For each Schema, the decorator validates the corresponding DataFrame. It only executes the decorated function if all inputs/outputs pass validation.
     """
 
+    def log(message):
+        # A single write per line, so lines from concurrent validations do not interleave mid-line
+        sys.stdout.write(message + "\n")
+
+    def validate_arg(i, schema_in, df):
+        # Schema.validate already skips DataFrames that passed this Schema (e.g. the return value of a function with
+        # 'returns=schema_in'); checking here as well only keeps the verbose progress lines quiet for them
+        if schema_in._has_passed(df):
+            return True
+        if schema_in.verbose:
+            log(f"Validating argument at index {i}...")
+        if not schema_in.validate(df):  # If DataFrame fails validation...
+            return False
+        else:
+            if schema_in.verbose:
+                log("Passed!")
+            return True
+
     def validate_i(schemata, args_):
-        for i in range(len(schemata)):
-            schema_in = schemata[i]
-            if schema_in:
-                print(f"Validating argument at index {i}...")
-                df = args_[i]
-                if not schema_in.validate(df):  # If DataFrame fails validation...
-                    return False
-                else:
-                    print("Passed!")
-                    return True
+        # Validate every argument that has a Schema (rather than stopping after the first), so all errors are logged
+        pending = [
+            (i, schema_in, df)
+            for i, (schema_in, df) in enumerate(zip(schemata, args_))
+            if schema_in
+        ]
+        if len(pending) < 2:
+            return all([validate_arg(*p) for p in pending])
+        # Validate multiple DataFrames concurrently, since pandas/NumPy release the GIL for much of the work
+        with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+            results = list(executor.map(lambda p: validate_arg(*p), pending))
+        return all(results)
 
     def validate_o(schema_out, output):
-        print(f"Validating return value...")
+        if schema_out.verbose:
+            log("Validating return value...")
         if not schema_out.validate(output):
             return False
         else:
-            print("Passed!")
+            if schema_out.verbose:
+                log("Passed!")
             return True
 
     def decorator(func: Callable[[Any], Any]) -> Callable[[Any], Any]: